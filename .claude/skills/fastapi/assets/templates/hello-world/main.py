@@ -7,18 +7,34 @@ Run with: fastapi dev main.py
 Visit: http://127.0.0.1:8000/docs for interactive API documentation
 """
 
-from fastapi import FastAPI, HTTPException
+import logging
+from dataclasses import dataclass
+from itertools import islice
+from typing import Dict, List, Optional
+
+import orjson
+from fast_cache_middleware import CacheConfig, CacheDropConfig, FastCacheMiddleware
+from fastapi import FastAPI, HTTPException, Query, Response
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
-from typing import List, Optional
 
 app = FastAPI(
     title="{{PROJECT_NAME}}",
     description="A basic FastAPI application",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
-# In-memory database (for demonstration)
-items_db = []
+# Cache GET responses in memory; routes opt in with CacheConfig and
+# writes invalidate cached /items responses with CacheDropConfig
+app.add_middleware(FastCacheMiddleware)
+invalidate_items = CacheDropConfig(paths=["/items"])
+
+# fast-cache-middleware 0.0.7 logs every cache miss at ERROR level
+# ("Couldn't get the cache: ..."); drop those, keep real storage failures
+logging.getLogger("fast_cache_middleware.controller").addFilter(
+    lambda record: not record.getMessage().startswith("Couldn't get the cache")
+)
 
 
 # Pydantic models
@@ -34,81 +50,145 @@ class ItemCreate(BaseModel):
     description: Optional[str] = None
 
 
+# Storage row: a slotted dataclass is smaller than a model instance and
+# skips validation; data is validated once on the way in via ItemCreate
+@dataclass(slots=True)
+class _ItemRow:
+    id: int
+    title: str
+    description: Optional[str]
+    completed: bool = False
+
+
+def _to_item(row: _ItemRow) -> Item:
+    """Build the response model from a trusted row without re-validating"""
+    return Item.model_construct(
+        id=row.id,
+        title=row.title,
+        description=row.description,
+        completed=row.completed
+    )
+
+
+# In-memory database (for demonstration), keyed by item ID for O(1) lookups
+items_db: Dict[int, _ItemRow] = {}
+_next_id = 0
+
+
+# Constant response bodies, serialized once at import
+_ROOT_BODY = orjson.dumps({
+    "message": "Welcome to {{PROJECT_NAME}}!",
+    "docs": "/docs",
+    "endpoints": {
+        "create_item": "POST /items",
+        "list_items": "GET /items",
+        "get_item": "GET /items/{item_id}",
+        "update_item": "PUT /items/{item_id}",
+        "delete_item": "DELETE /items/{item_id}"
+    }
+})
+_HEALTH_BODY = orjson.dumps({"status": "healthy"})
+
+
 # Routes
 
 @app.get("/")
-def root():
+async def root():
     """Welcome endpoint"""
-    return {
-        "message": "Welcome to {{PROJECT_NAME}}!",
-        "docs": "/docs",
-        "endpoints": {
-            "create_item": "POST /items",
-            "list_items": "GET /items",
-            "get_item": "GET /items/{item_id}",
-            "update_item": "PUT /items/{item_id}",
-            "delete_item": "DELETE /items/{item_id}"
-        }
-    }
+    return Response(_ROOT_BODY, media_type="application/json")
 
 
 @app.get("/health")
-def health_check():
+async def health_check():
     """Health check endpoint"""
-    return {"status": "healthy"}
+    return Response(_HEALTH_BODY, media_type="application/json")
 
 
-@app.post("/items", response_model=Item, status_code=201)
-def create_item(item: ItemCreate):
+@app.post("/items", response_model=Item, status_code=201, dependencies=[invalidate_items])
+async def create_item(item: ItemCreate):
     """Create a new item"""
-    new_item = Item(
-        id=len(items_db) + 1,
+    global _next_id
+    _next_id += 1
+    row = _ItemRow(
+        id=_next_id,
         title=item.title,
         description=item.description
     )
-    items_db.append(new_item)
-    return new_item
+    items_db[_next_id] = row
+    return _to_item(row)
 
 
-@app.get("/items", response_model=List[Item])
-def list_items(skip: int = 0, limit: int = 10):
+# No response_model: the page is encoded straight from the rows in one orjson
+# pass instead of building and validating an Item per row. The schema is still
+# declared under responses for the OpenAPI docs.
+@app.get(
+    "/items",
+    responses={200: {"model": List[Item]}},
+    dependencies=[CacheConfig(max_age=5)]
+)
+async def list_items(skip: int = Query(0, ge=0), limit: int = Query(10, ge=0)):
     """List all items with pagination"""
-    return items_db[skip: skip + limit]
+    rows = islice(items_db.values(), skip, skip + limit)
+    return Response(
+        orjson.dumps([
+            {
+                "id": row.id,
+                "title": row.title,
+                "description": row.description,
+                "completed": row.completed
+            }
+            for row in rows
+        ]),
+        media_type="application/json"
+    )
 
 
-@app.get("/items/{item_id}", response_model=Item)
-def get_item(item_id: int):
+@app.get("/items/{item_id}", response_model=Item, dependencies=[CacheConfig(max_age=30)])
+async def get_item(item_id: int):
     """Get a specific item by ID"""
-    for item in items_db:
-        if item.id == item_id:
-            return item
+    row = items_db.get(item_id)
+    if row is None:
+        raise HTTPException(status_code=404, detail=f"Item {item_id} not found")
 
-    raise HTTPException(status_code=404, detail=f"Item {item_id} not found")
+    return _to_item(row)
 
 
-@app.put("/items/{item_id}", response_model=Item)
-def update_item(item_id: int, item_update: ItemCreate):
+@app.put("/items/{item_id}", response_model=Item, dependencies=[invalidate_items])
+async def update_item(item_id: int, item_update: ItemCreate):
     """Update an existing item"""
-    for item in items_db:
-        if item.id == item_id:
-            item.title = item_update.title
-            item.description = item_update.description
-            return item
+    row = items_db.get(item_id)
+    if row is None:
+        raise HTTPException(status_code=404, detail=f"Item {item_id} not found")
 
-    raise HTTPException(status_code=404, detail=f"Item {item_id} not found")
+    row.title = item_update.title
+    row.description = item_update.description
+    return _to_item(row)
 
 
-@app.delete("/items/{item_id}", status_code=204)
-def delete_item(item_id: int):
+@app.delete("/items/{item_id}", status_code=204, dependencies=[invalidate_items])
+async def delete_item(item_id: int):
     """Delete an item"""
-    for idx, item in enumerate(items_db):
-        if item.id == item_id:
-            items_db.pop(idx)
-            return
-
-    raise HTTPException(status_code=404, detail=f"Item {item_id} not found")
+    if items_db.pop(item_id, None) is None:
+        raise HTTPException(status_code=404, detail=f"Item {item_id} not found")
 
 
 if __name__ == "__main__":
+    import os
+    import sys
+
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+
+    # Per-request access logging is skipped in production (ENV=production)
+    access_log = os.getenv("ENV") != "production"
+
+    # uvloop (libuv event loop) and httptools (C HTTP parser) replace the
+    # pure-Python asyncio loop and h11 parser. uvloop is not available on Windows.
+    uvicorn.run(
+        app,
+        host="0.0.0.0",
+        port=8000,
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+        access_log=access_log,
+        log_level="info" if access_log else "warning",
+    )
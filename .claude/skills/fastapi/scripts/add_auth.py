@@ -6,9 +6,13 @@ Adds authentication scaffolding including:
 - User model
 - JWT token generation and validation
 - Password hashing
-- Login/register endpoints
+- Login/register/logout endpoints
+- Token cache (Redis or in-process) for authenticated requests
 - Protected route examples
 
+The generated routes use AsyncSession, so the project needs the async
+database configuration from add_database.py (not its --sync variant).
+
 Usage:
     python add_auth.py [--output-dir DIR]
 
@@ -25,31 +29,142 @@ from pathlib import Path
 AUTH_ROUTER_TEMPLATE = '''"""
 Authentication routes for user registration and login.
 """
+import asyncio
+import hashlib
+import hmac
+import logging
+import os
+import secrets
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from typing import Optional
 
+import jwt
+import msgpack
+from cachetools import TTLCache
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from jose import JWTError, jwt
+from jwt.exceptions import InvalidTokenError as JWTError
 from passlib.context import CryptContext
 from pydantic import BaseModel, EmailStr
-from sqlalchemy.orm import Session
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from .database import get_db
 from .models import User
 
+logger = logging.getLogger(__name__)
+
 
 # JWT Configuration
 SECRET_KEY = "your-secret-key-here-change-in-production"  # Change this!
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Bound once instead of rebuilt on every jwt.decode call
+_ALGS = (ALGORITHM,)
+_DECODE_OPTS = {"require": ["exp", "sub"], "verify_aud": False}
+
+# Argon2id with the OWASP baseline parameters (46 MiB, 1 iteration, 1 lane).
+# bcrypt stays listed as deprecated so existing hashes still verify and are
+# upgraded to Argon2 on the user's next login.
+pwd_context = CryptContext(
+    schemes=["argon2", "bcrypt"],
+    deprecated="auto",
+    argon2__memory_cost=47104,
+    argon2__time_cost=1,
+    argon2__parallelism=1,
+)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
 router = APIRouter(prefix="/auth", tags=["authentication"])
 
 
+# Token cache: maps an access token to the user it was issued for, so
+# authenticated requests skip the user SELECT. Set REDIS_URL to share the
+# cache (and revocations) across workers; without it a bounded in-process
+# LRU is used, which is only correct for a single worker.
+# Cached user fields (e.g. is_active) can be up to TOKEN_CACHE_TTL stale.
+# With REDIS_URL set, revocations live only in Redis, so requests fail
+# closed (503) while Redis is unreachable rather than accept logged-out tokens.
+REDIS_URL = os.getenv("REDIS_URL")
+TOKEN_CACHE_TTL = ACCESS_TOKEN_EXPIRE_MINUTES * 60
+TOKEN_CACHE_MAXSIZE = 1024
+TOKEN_REVOKED_MAXSIZE = 16384
+
+
+class TokenCache:
+    def __init__(self, redis_url: Optional[str] = None, maxsize: int = TOKEN_CACHE_MAXSIZE):
+        self.redis = Redis.from_url(redis_url) if redis_url else None
+        self.maxsize = maxsize
+        self._users: OrderedDict = OrderedDict()  # key -> (expires_at, user dict)
+        # Bounded: once full, the oldest revocations are dropped early
+        self._revoked = TTLCache(maxsize=TOKEN_REVOKED_MAXSIZE, ttl=TOKEN_CACHE_TTL)
+
+    @staticmethod
+    def key(token: str) -> str:
+        # Full digest: a truncated key could map one user's token to another's
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    async def lookup(self, key: str):
+        """
+        Return (revoked, cached user dict or None) for a token key.
+
+        Redis errors propagate: the revocation state is unknown, and the
+        in-process fallback would not know about other workers' logouts.
+        """
+        # Also holds revocations made here while Redis was down
+        if key in self._revoked:
+            return True, None
+
+        if self.redis is not None:
+            revoked, packed = await self.redis.mget(f"revoked:{key}", f"token:{key}")
+            return revoked is not None, msgpack.unpackb(packed) if packed else None
+
+        now = time.monotonic()
+        entry = self._users.get(key)
+        if entry is None:
+            return False, None
+        expires_at, user = entry
+        if expires_at <= now:
+            del self._users[key]
+            return False, None
+        self._users.move_to_end(key)
+        return False, user
+
+    async def set(self, key: str, user: dict, ttl: int = TOKEN_CACHE_TTL):
+        if self.redis is not None:
+            try:
+                await self.redis.set(f"token:{key}", msgpack.packb(user), ex=ttl)
+                return
+            except (RedisError, OSError) as exc:
+                logger.warning("Token cache unavailable: %s", exc)
+
+        self._users[key] = (time.monotonic() + ttl, user)
+        self._users.move_to_end(key)
+        if len(self._users) > self.maxsize:
+            self._users.popitem(last=False)
+
+    async def revoke(self, key: str, ttl: int = TOKEN_CACHE_TTL):
+        if self.redis is not None:
+            try:
+                await self.redis.set(f"revoked:{key}", 1, ex=ttl)
+                await self.redis.delete(f"token:{key}")
+                return
+            except (RedisError, OSError) as exc:
+                # Still revoked in this worker; other workers accept the token until it expires
+                logger.warning("Token revocation not shared, Redis unavailable: %s", exc)
+
+        self._revoked[key] = True
+        self._users.pop(key, None)
+
+
+token_cache = TokenCache(REDIS_URL)
+
+
 # Schemas
 class UserCreate(BaseModel):
     email: EmailStr
@@ -67,6 +182,21 @@ class UserResponse(BaseModel):
         from_attributes = True
 
 
+class CurrentUser(BaseModel):
+    """
+    Snapshot of the authenticated user, built from the token cache or the
+    database. It is not attached to a session: to change the user, load
+    it with `await db.get(User, current_user.id)`.
+    """
+    id: int
+    email: str
+    username: str
+    is_active: bool
+
+    class Config:
+        from_attributes = True
+
+
 class Token(BaseModel):
     access_token: str
     token_type: str
@@ -76,7 +206,23 @@ class TokenData(BaseModel):
     username: Optional[str] = None
 
 
+# Short-lived, in-process cache of *failed* password checks, so clients
+# retrying the same wrong password don't re-run the memory-hard hash each
+# time. Successful checks are never cached. Keys are HMACs under a random
+# per-process secret, so nothing derived from a password is recoverable
+# without it; keys include the stored hash, so a password change drops them.
+_failed_verify_cache = TTLCache(maxsize=2048, ttl=60)
+_VERIFY_CACHE_SECRET = secrets.token_bytes(32)
+
+
+def _credentials_key(username: str, password: str, hashed_password: str) -> bytes:
+    material = "\\0".join((username, password, hashed_password)).encode()
+    return hmac.new(_VERIFY_CACHE_SECRET, material, hashlib.sha256).digest()
+
+
 # Password hashing
+# Argon2 takes tens of milliseconds of CPU per call; the async handlers run
+# it via asyncio.to_thread so a login doesn't stall the event loop.
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
@@ -97,26 +243,42 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     return encoded_jwt
 
 
-def get_user_by_username(db: Session, username: str):
-    return db.query(User).filter(User.username == username).first()
+async def get_user_by_username(db: AsyncSession, username: str):
+    result = await db.execute(select(User).where(User.username == username))
+    return result.scalar_one_or_none()
 
 
-def get_user_by_email(db: Session, email: str):
-    return db.query(User).filter(User.email == email).first()
+async def get_user_by_email(db: AsyncSession, email: str):
+    result = await db.execute(select(User).where(User.email == email))
+    return result.scalar_one_or_none()
 
 
-def authenticate_user(db: Session, username: str, password: str):
-    user = get_user_by_username(db, username)
+async def authenticate_user(db: AsyncSession, username: str, password: str):
+    user = await get_user_by_username(db, username)
     if not user:
         return False
-    if not verify_password(password, user.hashed_password):
+
+    cache_key = _credentials_key(username, password, user.hashed_password)
+    if cache_key in _failed_verify_cache:
         return False
+
+    verified, new_hash = await asyncio.to_thread(
+        pwd_context.verify_and_update, password, user.hashed_password
+    )
+    if not verified:
+        _failed_verify_cache[cache_key] = True
+        return False
+
+    if new_hash:
+        # Rehash legacy (bcrypt) or outdated Argon2 hashes with the current settings
+        user.hashed_password = new_hash
+        await db.commit()
     return user
 
 
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -124,7 +286,7 @@ async def get_current_user(
         headers={"WWW-Authenticate": "Bearer"},
     )
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = jwt.decode(token, SECRET_KEY, algorithms=_ALGS, options=_DECODE_OPTS)
         username: str = payload.get("sub")
         if username is None:
             raise credentials_exception
@@ -132,13 +294,30 @@ async def get_current_user(
     except JWTError:
         raise credentials_exception
 
-    user = get_user_by_username(db, username=token_data.username)
+    cache_key = TokenCache.key(token)
+    try:
+        revoked, cached = await token_cache.lookup(cache_key)
+    except (RedisError, OSError) as exc:
+        logger.warning("Token cache unavailable, rejecting request: %s", exc)
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Authentication temporarily unavailable",
+        )
+    if revoked:
+        raise credentials_exception
+    if cached is not None:
+        return CurrentUser(**cached)
+
+    user = await get_user_by_username(db, username=token_data.username)
     if user is None:
         raise credentials_exception
-    return user
 
+    current_user = CurrentUser.model_validate(user)
+    await token_cache.set(cache_key, current_user.model_dump())
+    return current_user
 
-async def get_current_active_user(current_user: User = Depends(get_current_user)):
+
+async def get_current_active_user(current_user: CurrentUser = Depends(get_current_user)):
     if not current_user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
     return current_user
@@ -146,24 +325,24 @@ async def get_current_active_user(current_user: User = Depends(get_current_user)
 
 # Routes
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-def register(user_data: UserCreate, db: Session = Depends(get_db)):
+async def register(user_data: UserCreate, db: AsyncSession = Depends(get_db)):
     """Register a new user."""
 
     # Check if user already exists
-    if get_user_by_email(db, user_data.email):
+    if await get_user_by_email(db, user_data.email):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
 
-    if get_user_by_username(db, user_data.username):
+    if await get_user_by_username(db, user_data.username):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Username already taken"
         )
 
     # Create new user
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await asyncio.to_thread(get_password_hash, user_data.password)
     db_user = User(
         email=user_data.email,
         username=user_data.username,
@@ -171,19 +350,19 @@ def register(user_data: UserCreate, db: Session = Depends(get_db)):
     )
 
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
 
     return db_user
 
 
 @router.post("/login", response_model=Token)
-def login(
+async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Login to get access token."""
-    user = authenticate_user(db, form_data.username, form_data.password)
+    user = await authenticate_user(db, form_data.username, form_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -199,8 +378,17 @@ def login(
     return {"access_token": access_token, "token_type": "bearer"}
 
 
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(
+    token: str = Depends(oauth2_scheme),
+    current_user: CurrentUser = Depends(get_current_user)
+):
+    """Revoke the current access token."""
+    await token_cache.revoke(TokenCache.key(token))
+
+
 @router.get("/me", response_model=UserResponse)
-async def read_users_me(current_user: User = Depends(get_current_active_user)):
+async def read_users_me(current_user: CurrentUser = Depends(get_current_active_user)):
     """Get current user information."""
     return current_user
 '''
@@ -226,9 +414,13 @@ class User(Base):
 '''
 
 REQUIREMENTS_TEMPLATE = '''# Authentication dependencies
-python-jose[cryptography]==3.3.0
-passlib[bcrypt]==1.7.4
+PyJWT[crypto]==2.8.0
+passlib[argon2,bcrypt]==1.7.4
+argon2-cffi==23.1.0
 python-multipart==0.0.6
+redis==5.0.1
+msgpack==1.0.7
+cachetools==5.3.2
 '''
 
 
@@ -256,17 +448,26 @@ def add_auth(output_dir: str):
     print(f"Creating {req_snippet}...")
     req_snippet.write_text(REQUIREMENTS_TEMPLATE, encoding='utf-8')
 
+    db_file = output_path / "database.py"
+    if db_file.exists() and "create_async_engine" not in db_file.read_text(encoding='utf-8'):
+        print(f"\nWarning: {db_file} uses a synchronous engine, but auth.py expects")
+        print("an AsyncSession from get_db. Regenerate it without --sync:")
+        print("     python add_database.py --db-type <type>")
+
     print("\n✅ Authentication scaffolding added successfully!")
     print("\nNext steps:")
     print("  1. Install dependencies:")
-    print("     pip install python-jose[cryptography] passlib[bcrypt] python-multipart")
+    print("     pip install PyJWT[crypto] passlib[argon2,bcrypt] argon2-cffi python-multipart redis msgpack cachetools")
     print("\n  2. Add User model to your models.py:")
     print("     (See user_model_snippet.py for the model code)")
     print("\n  3. Include the auth router in your main.py:")
     print("     from auth import router as auth_router")
     print("     app.include_router(auth_router)")
     print("\n  4. Change SECRET_KEY in auth.py to a secure random string")
+    print("     Set REDIS_URL to cache authenticated users in Redis (required")
+    print("     when running more than one worker, so logouts apply everywhere)")
     print("\n  5. Run migrations to create users table")
+    print("\n  Auth requires the async database setup (add_database.py without --sync)")
     print("\nTest the endpoints at http://127.0.0.1:8000/docs")
 
 
@@ -5,14 +5,18 @@ Generate CRUD Endpoints for a Model
 Creates a router file with full CRUD operations for a database model.
 
 Usage:
-    python generate_crud.py --model MODEL_NAME [--output-dir DIR]
+    python generate_crud.py --model MODEL_NAME [--output-dir DIR] [--sync]
+    python generate_crud.py --models MODEL_A,MODEL_B [--output-dir DIR] [--sync]
 
 Examples:
     python generate_crud.py --model Product
     python generate_crud.py --model User --output-dir ./my-project/routers
+    python generate_crud.py --model Product --sync
+    python generate_crud.py --models Product,User,Article
 """
 
 import argparse
+import string
 from pathlib import Path
 
 
@@ -23,7 +27,8 @@ from typing import List
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..database import get_db
 from ..models import {{MODEL_NAME}}
@@ -70,33 +75,38 @@ class {{MODEL_NAME}}Response({{MODEL_NAME}}Base):
     response_model={{MODEL_NAME}}Response,
     status_code=status.HTTP_201_CREATED
 )
-def create_{{model_lower}}(
+async def create_{{model_lower}}(
     {{model_lower}}: {{MODEL_NAME}}Create,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Create a new {{MODEL_NAME}}."""
     db_{{model_lower}} = {{MODEL_NAME}}(**{{model_lower}}.model_dump())
     db.add(db_{{model_lower}})
-    db.commit()
-    db.refresh(db_{{model_lower}})
+    await db.commit()
+    await db.refresh(db_{{model_lower}})
     return db_{{model_lower}}
 
 
 @router.get("/", response_model=List[{{MODEL_NAME}}Response])
-def list_{{model_lower}}s(
+async def list_{{model_lower}}s(
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """List all {{MODEL_NAME}}s with pagination."""
-    {{model_lower}}s = db.query({{MODEL_NAME}}).offset(skip).limit(limit).all()
-    return {{model_lower}}s
+    statement = select({{MODEL_NAME}}).offset(skip).limit(limit)
+    # If the response includes relationships, load them in one extra
+    # IN (...) query instead of one query per row (N+1):
+    # from sqlalchemy.orm import selectinload
+    # statement = statement.options(selectinload({{MODEL_NAME}}.relationship_name))
+    result = await db.execute(statement)
+    return result.scalars().all()
 
 
 @router.get("/{id}", response_model={{MODEL_NAME}}Response)
-def get_{{model_lower}}(id: int, db: Session = Depends(get_db)):
+async def get_{{model_lower}}(id: int, db: AsyncSession = Depends(get_db)):
     """Get a specific {{MODEL_NAME}} by ID."""
-    {{model_lower}} = db.query({{MODEL_NAME}}).filter({{MODEL_NAME}}.id == id).first()
+    {{model_lower}} = await db.get({{MODEL_NAME}}, id)
 
     if not {{model_lower}}:
         raise HTTPException(
@@ -108,13 +118,13 @@ def get_{{model_lower}}(id: int, db: Session = Depends(get_db)):
 
 
 @router.put("/{id}", response_model={{MODEL_NAME}}Response)
-def update_{{model_lower}}(
+async def update_{{model_lower}}(
     id: int,
     {{model_lower}}_update: {{MODEL_NAME}}Update,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Update a {{MODEL_NAME}}."""
-    db_{{model_lower}} = db.query({{MODEL_NAME}}).filter({{MODEL_NAME}}.id == id).first()
+    db_{{model_lower}} = await db.get({{MODEL_NAME}}, id)
 
     if not db_{{model_lower}}:
         raise HTTPException(
@@ -126,15 +136,164 @@ def update_{{model_lower}}(
     for key, value in {{model_lower}}_update.model_dump(exclude_unset=True).items():
         setattr(db_{{model_lower}}, key, value)
 
-    db.commit()
-    db.refresh(db_{{model_lower}})
+    await db.commit()
+    await db.refresh(db_{{model_lower}})
     return db_{{model_lower}}
 
 
 @router.delete("/{id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_{{model_lower}}(id: int, db: Session = Depends(get_db)):
+async def delete_{{model_lower}}(id: int, db: AsyncSession = Depends(get_db)):
+    """Delete a {{MODEL_NAME}}."""
+    db_{{model_lower}} = await db.get({{MODEL_NAME}}, id)
+
+    if not db_{{model_lower}}:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="{{MODEL_NAME}} not found"
+        )
+
+    await db.delete(db_{{model_lower}})
+    await db.commit()
+    return None
+'''
+
+
+# Synchronous fallback (--sync) for projects whose database.py uses a sync driver.
+# Blocking Session calls run in a worker thread so the event loop keeps serving.
+SYNC_CRUD_ROUTER_TEMPLATE = '''"""
+CRUD operations for {{MODEL_NAME}}.
+
+The Session is synchronous, so each blocking database call is run in a
+worker thread with asyncio.to_thread instead of on the event loop.
+"""
+import asyncio
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+
+from ..database import get_db
+from ..models import {{MODEL_NAME}}
+
+
+router = APIRouter(
+    prefix="/{{model_lower}}s",
+    tags=["{{model_lower}}s"]
+)
+
+
+# Schemas
+class {{MODEL_NAME}}Base(BaseModel):
+    """Base schema for {{MODEL_NAME}}"""
+    # TODO: Add your model fields here
+    # Example:
+    # title: str
+    # description: str | None = None
+    pass
+
+
+class {{MODEL_NAME}}Create({{MODEL_NAME}}Base):
+    """Schema for creating a {{MODEL_NAME}}"""
+    pass
+
+
+class {{MODEL_NAME}}Update({{MODEL_NAME}}Base):
+    """Schema for updating a {{MODEL_NAME}}"""
+    pass
+
+
+class {{MODEL_NAME}}Response({{MODEL_NAME}}Base):
+    """Schema for {{MODEL_NAME}} response"""
+    id: int
+
+    class Config:
+        from_attributes = True
+
+
+# CRUD Operations
+
+@router.post(
+    "/",
+    response_model={{MODEL_NAME}}Response,
+    status_code=status.HTTP_201_CREATED
+)
+async def create_{{model_lower}}(
+    {{model_lower}}: {{MODEL_NAME}}Create,
+    db: Session = Depends(get_db)
+):
+    """Create a new {{MODEL_NAME}}."""
+    db_{{model_lower}} = {{MODEL_NAME}}(**{{model_lower}}.model_dump())
+
+    def _create():
+        db.add(db_{{model_lower}})
+        db.commit()
+        db.refresh(db_{{model_lower}})
+        return db_{{model_lower}}
+
+    return await asyncio.to_thread(_create)
+
+
+@router.get("/", response_model=List[{{MODEL_NAME}}Response])
+async def list_{{model_lower}}s(
+    skip: int = 0,
+    limit: int = 100,
+    db: Session = Depends(get_db)
+):
+    """List all {{MODEL_NAME}}s with pagination."""
+    query = db.query({{MODEL_NAME}}).offset(skip).limit(limit)
+    # If the response includes relationships, load them in one extra
+    # IN (...) query instead of one query per row (N+1):
+    # from sqlalchemy.orm import selectinload
+    # query = query.options(selectinload({{MODEL_NAME}}.relationship_name))
+    return await asyncio.to_thread(query.all)
+
+
+@router.get("/{id}", response_model={{MODEL_NAME}}Response)
+async def get_{{model_lower}}(id: int, db: Session = Depends(get_db)):
+    """Get a specific {{MODEL_NAME}} by ID."""
+    {{model_lower}} = await asyncio.to_thread(db.get, {{MODEL_NAME}}, id)
+
+    if not {{model_lower}}:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="{{MODEL_NAME}} not found"
+        )
+
+    return {{model_lower}}
+
+
+@router.put("/{id}", response_model={{MODEL_NAME}}Response)
+async def update_{{model_lower}}(
+    id: int,
+    {{model_lower}}_update: {{MODEL_NAME}}Update,
+    db: Session = Depends(get_db)
+):
+    """Update a {{MODEL_NAME}}."""
+    db_{{model_lower}} = await asyncio.to_thread(db.get, {{MODEL_NAME}}, id)
+
+    if not db_{{model_lower}}:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="{{MODEL_NAME}} not found"
+        )
+
+    def _update():
+        # Update fields
+        for key, value in {{model_lower}}_update.model_dump(exclude_unset=True).items():
+            setattr(db_{{model_lower}}, key, value)
+
+        db.commit()
+        db.refresh(db_{{model_lower}})
+        return db_{{model_lower}}
+
+    return await asyncio.to_thread(_update)
+
+
+@router.delete("/{id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_{{model_lower}}(id: int, db: Session = Depends(get_db)):
     """Delete a {{MODEL_NAME}}."""
-    db_{{model_lower}} = db.query({{MODEL_NAME}}).filter({{MODEL_NAME}}.id == id).first()
+    db_{{model_lower}} = await asyncio.to_thread(db.get, {{MODEL_NAME}}, id)
 
     if not db_{{model_lower}}:
         raise HTTPException(
@@ -142,13 +301,49 @@ def delete_{{model_lower}}(id: int, db: Session = Depends(get_db)):
             detail="{{MODEL_NAME}} not found"
         )
 
-    db.delete(db_{{model_lower}})
-    db.commit()
+    def _delete():
+        db.delete(db_{{model_lower}})
+        db.commit()
+
+    await asyncio.to_thread(_delete)
     return None
 '''
 
 
-def generate_crud(model_name: str, output_dir: str):
+def _compile(template: str) -> string.Template:
+    """Convert {{...}} placeholders to a string.Template (substituted in one pass)."""
+    return string.Template(
+        template.replace('{{MODEL_NAME}}', '${MODEL}').replace('{{model_lower}}', '${model}')
+    )
+
+
+_CRUD_TEMPLATE = _compile(CRUD_ROUTER_TEMPLATE)
+_SYNC_CRUD_TEMPLATE = _compile(SYNC_CRUD_ROUTER_TEMPLATE)
+
+
+def _write_router(model_name: str, output_path: Path, sync: bool) -> Path:
+    """Render the CRUD router for a model and write it to output_path."""
+    model_lower = model_name.lower()
+    template = _SYNC_CRUD_TEMPLATE if sync else _CRUD_TEMPLATE
+    content = template.substitute(MODEL=model_name, model=model_lower)
+
+    router_file = output_path / f"{model_lower}.py"
+    print(f"Creating {router_file}...")
+    router_file.write_bytes(content.encode('utf-8'))
+    return router_file
+
+
+def _print_thread_limit_hint():
+    print(f"\n     Database calls run via asyncio.to_thread; to allow more than the")
+    print(f"     default 40 concurrent worker threads, raise the limit at startup:")
+    print(f"     @asynccontextmanager")
+    print(f"     async def lifespan(app):")
+    print(f"         anyio.to_thread.current_default_thread_limiter().total_tokens = 100")
+    print(f"         yield")
+    print(f"     app = FastAPI(lifespan=lifespan)")
+
+
+def generate_crud(model_name: str, output_dir: str, sync: bool = False):
     """Generate CRUD router for a model."""
 
     output_path = Path(output_dir)
@@ -156,14 +351,8 @@ def generate_crud(model_name: str, output_dir: str):
 
     model_lower = model_name.lower()
 
-    # Replace placeholders
-    content = CRUD_ROUTER_TEMPLATE.replace('{{MODEL_NAME}}', model_name)
-    content = content.replace('{{model_lower}}', model_lower)
-
     # Create router file
-    router_file = output_path / f"{model_lower}.py"
-    print(f"Creating {router_file}...")
-    router_file.write_text(content, encoding='utf-8')
+    router_file = _write_router(model_name, output_path, sync)
 
     print(f"\n✅ CRUD router for '{model_name}' created successfully!")
     print(f"\nGenerated file: {router_file}")
@@ -174,6 +363,8 @@ def generate_crud(model_name: str, output_dir: str):
     print(f"\n  3. Include the router in your main.py:")
     print(f"     from .routers.{model_lower} import router as {model_lower}_router")
     print(f"     app.include_router({model_lower}_router)")
+    if sync:
+        _print_thread_limit_hint()
     print(f"\n  4. Test the endpoints at http://127.0.0.1:8000/docs")
     print(f"\nAvailable endpoints:")
     print(f"  POST   /{model_lower}s/     - Create a new {model_name}")
@@ -183,25 +374,65 @@ def generate_crud(model_name: str, output_dir: str):
     print(f"  DELETE /{model_lower}s/{{id}} - Delete a {model_name}")
 
 
+def generate_many(model_names: list[str], output_dir: str, sync: bool = False):
+    """Generate CRUD routers for several models into one directory."""
+
+    output_path = Path(output_dir)
+    output_path.mkdir(parents=True, exist_ok=True)
+
+    router_files = [_write_router(name, output_path, sync) for name in model_names]
+
+    print(f"\n✅ {len(router_files)} CRUD routers created successfully!")
+    print("\nNext steps:")
+    print(f"  1. Update the schema fields in each generated file")
+    print(f"     (Replace the TODO comments with actual fields)")
+    print(f"\n  2. Ensure these models exist in models.py: {', '.join(model_names)}")
+    print(f"\n  3. Include the routers in your main.py:")
+    for name in model_names:
+        model_lower = name.lower()
+        print(f"     from .routers.{model_lower} import router as {model_lower}_router")
+    for name in model_names:
+        print(f"     app.include_router({name.lower()}_router)")
+    if sync:
+        _print_thread_limit_hint()
+    print(f"\n  4. Test the endpoints at http://127.0.0.1:8000/docs")
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Generate CRUD endpoints for a FastAPI model"
     )
 
-    parser.add_argument(
+    models = parser.add_mutually_exclusive_group(required=True)
+
+    models.add_argument(
         "--model",
-        required=True,
         help="Model name (e.g., Product, User, Article)"
     )
 
+    models.add_argument(
+        "--models",
+        help="Comma-separated model names (e.g., Product,User,Article)"
+    )
+
     parser.add_argument(
         "--output-dir",
         default="./routers",
         help="Output directory for router file (default: ./routers)"
     )
 
+    parser.add_argument(
+        "--sync",
+        action="store_true",
+        help="Target a synchronous Session (database.py created with add_database.py --sync)"
+    )
+
     args = parser.parse_args()
-    generate_crud(args.model, args.output_dir)
+    if args.models:
+        model_names = [name.strip() for name in args.models.split(',') if name.strip()]
+        generate_many(model_names, args.output_dir, args.sync)
+    else:
+        generate_crud(args.model, args.output_dir, args.sync)
 
 
 if __name__ == "__main__":
@@ -28,6 +28,33 @@ TEMPLATES = {
     "microservice": "Microservice architecture"
 }
 
+PLACEHOLDER = b'{{PROJECT_NAME}}'
+
+# Directories never copied from a template, and files copied without substitution
+SKIP_DIRS = frozenset({'__pycache__', '.git', 'venv', '.venv'})
+BINARY_EXTS = frozenset({'.pyc', '.pyo', '.so', '.dll', '.dylib'})
+
+DOCKERFILE_TEMPLATE = """\
+FROM python:3.12-slim AS base
+
+WORKDIR /app
+COPY requirements.txt .
+RUN pip install --no-cache-dir -r requirements.txt
+COPY . .
+EXPOSE 8000
+
+# Development: single worker with auto-reload (--reload cannot be combined with --workers)
+FROM base AS dev
+CMD ["fastapi", "dev", "main.py", "--host", "0.0.0.0", "--port", "8000"]
+
+# Production: one event loop per worker process. The template keeps data in
+# process memory, so it must stay on 1 worker until storage moves to a
+# database; then override with -e UVICORN_WORKERS=N
+FROM base AS production
+ENV UVICORN_WORKERS=1
+CMD ["sh", "-c", "uvicorn main:app --host 0.0.0.0 --port 8000 --workers ${UVICORN_WORKERS} --loop uvloop --http httptools --no-access-log"]
+"""
+
 
 def get_skill_dir():
     """Get the skill directory path."""
@@ -63,12 +90,16 @@ def scaffold_project(project_name, template_name, output_dir):
             sys.exit(0)
         shutil.rmtree(project_path)
 
-    # Copy template
+    # Copy template, replacing placeholders in the same pass
     print(f"Creating project '{project_name}' from template '{template_name}'...")
-    shutil.copytree(template_dir, project_path)
+    copy_with_substitution(
+        template_dir, project_path, {PLACEHOLDER: project_name.encode('utf-8')}
+    )
 
-    # Replace placeholders in files
-    replace_placeholders(project_path, project_name)
+    # Add a production Dockerfile unless the template ships its own
+    dockerfile = project_path / "Dockerfile"
+    if not dockerfile.exists():
+        dockerfile.write_text(DOCKERFILE_TEMPLATE, encoding='utf-8')
 
     print(f"\n✅ Project created successfully at: {project_path}")
     print(f"\nNext steps:")
@@ -77,31 +108,42 @@ def scaffold_project(project_name, template_name, output_dir):
     print(f"  3. source venv/bin/activate  # On Windows: venv\\Scripts\\activate")
     print(f"  4. pip install -r requirements.txt")
     print(f"  5. fastapi dev main.py")
+    print(f"\nFor production, run with the uvloop event loop and httptools parser:")
+    print(f"  uvicorn main:app --host 0.0.0.0 --port 8000 --workers 1 --loop uvloop --http httptools --no-access-log")
+    print(f"  # stay on 1 worker until items are stored in a database (see add_database.py)")
+    print(f"  # or build the production image: docker build --target production -t {project_name} .")
     print(f"\nVisit http://127.0.0.1:8000/docs for interactive API documentation")
 
 
-def replace_placeholders(project_path, project_name):
-    """Replace {{PROJECT_NAME}} placeholders in all files."""
+def copy_with_substitution(src, dst, replacements):
+    """Copy the src tree to dst, applying byte replacements to text files.
 
-    for root, dirs, files in os.walk(project_path):
-        # Skip __pycache__ and .git directories
-        dirs[:] = [d for d in dirs if d not in ['__pycache__', '.git', 'venv', '.venv']]
+    Each file is read once and written once; directories such as
+    __pycache__, .git and virtualenvs are not copied.
+    """
+    os.makedirs(dst, exist_ok=True)
 
-        for file in files:
-            file_path = Path(root) / file
+    # scandir entries carry the file type from the directory listing,
+    # so no extra stat() call is needed per entry
+    with os.scandir(src) as entries:
+        for entry in entries:
+            dst_path = Path(dst) / entry.name
 
-            # Skip binary files
-            if file_path.suffix in ['.pyc', '.pyo', '.so', '.dll', '.dylib']:
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name not in SKIP_DIRS:
+                    copy_with_substitution(entry.path, dst_path, replacements)
                 continue
 
-            try:
-                content = file_path.read_text(encoding='utf-8')
-                if '{{PROJECT_NAME}}' in content:
-                    content = content.replace('{{PROJECT_NAME}}', project_name)
-                    file_path.write_text(content, encoding='utf-8')
-            except (UnicodeDecodeError, PermissionError):
-                # Skip binary or protected files
-                pass
+            data = Path(entry.path).read_bytes()
+
+            # Skip substitution for binary files
+            if dst_path.suffix not in BINARY_EXTS:
+                for placeholder, value in replacements.items():
+                    if placeholder in data:
+                        data = data.replace(placeholder, value)
+
+            dst_path.write_bytes(data)
+            shutil.copymode(entry.path, dst_path)
 
 
 def main():
@@ -0,0 +1,124 @@
+"""
+Redis Response Cache for Task Reads
+
+Caches the encoded JSON bodies of GET /tasks/ and GET /tasks/{id} so
+repeated reads skip the database. Caching is disabled when REDIS_URL is
+not set.
+
+Every key embeds a generation number, and each write endpoint bumps it
+(one INCR) instead of deleting keys. Readers fetch the generation *before*
+querying the database, so a reader that raced a write stores its body
+under the old generation, where nobody looks it up again. Each key also
+carries its own TTL, so entries that missed an invalidation (e.g. during
+a Redis outage) expire within CACHE_TTL seconds.
+
+Redis failures never fail a request: errors are logged, the cache is
+bypassed for a short back-off window, and the handler falls through to
+the database.
+"""
+
+import logging
+import os
+import time
+from functools import lru_cache
+from typing import Optional
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+logger = logging.getLogger(__name__)
+
+REDIS_URL = os.getenv("REDIS_URL")
+CACHE_TTL = int(os.getenv("CACHE_TTL", "60"))
+
+# Seconds to skip Redis after an error, so an outage doesn't add a
+# socket timeout to every request
+RETRY_AFTER = 5.0
+
+GENERATION_KEY = "tasks:generation"
+
+_down_until = 0.0
+
+
+def item_key(task_id: int) -> str:
+    return f"item:{task_id}"
+
+
+def list_key(skip: int, limit: int, after_id: Optional[int]) -> str:
+    if after_id is not None:
+        return f"list:after:{after_id}:{limit}"
+    return f"list:skip:{skip}:{limit}"
+
+
+@lru_cache(maxsize=1)
+def get_redis() -> Optional[Redis]:
+    """Return the process-wide Redis client, or None if caching is disabled."""
+    if not REDIS_URL:
+        return None
+    return Redis.from_url(
+        REDIS_URL,
+        socket_connect_timeout=0.25,
+        socket_timeout=0.25,
+    )
+
+
+def _available() -> Optional[Redis]:
+    if time.monotonic() < _down_until:
+        return None
+    return get_redis()
+
+
+def _mark_down(exc: Exception) -> None:
+    global _down_until
+    _down_until = time.monotonic() + RETRY_AFTER
+    logger.warning("Redis unavailable, bypassing cache for %ss: %s", RETRY_AFTER, exc)
+
+
+async def generation() -> Optional[str]:
+    """
+    Return the current cache generation, or None if the cache is unusable.
+
+    Call this before reading from the database and pass the result to
+    fetch()/store() for the same request.
+    """
+    redis = _available()
+    if redis is None:
+        return None
+    try:
+        value = await redis.get(GENERATION_KEY)
+    except (RedisError, OSError) as exc:
+        _mark_down(exc)
+        return None
+    return value.decode() if value is not None else "0"
+
+
+async def fetch(gen: Optional[str], key: str) -> Optional[bytes]:
+    redis = _available()
+    if gen is None or redis is None:
+        return None
+    try:
+        return await redis.get(f"tasks:{gen}:{key}")
+    except (RedisError, OSError) as exc:
+        _mark_down(exc)
+        return None
+
+
+async def store(gen: Optional[str], key: str, body: bytes) -> None:
+    redis = _available()
+    if gen is None or redis is None:
+        return
+    try:
+        await redis.set(f"tasks:{gen}:{key}", body, ex=CACHE_TTL)
+    except (RedisError, OSError) as exc:
+        _mark_down(exc)
+
+
+async def invalidate() -> None:
+    """Start a new generation; every previously cached body becomes unreachable."""
+    redis = _available()
+    if redis is None:
+        return
+    try:
+        await redis.incr(GENERATION_KEY)
+    except (RedisError, OSError) as exc:
+        _mark_down(exc)
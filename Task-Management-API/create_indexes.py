@@ -0,0 +1,46 @@
+"""
+Create Missing Indexes
+
+One-off migration for databases whose tables were created before an index
+was added to a model (create_all at startup only builds indexes for new
+tables). Run it once per deploy, not from every app worker:
+
+    uv run python create_indexes.py
+
+On PostgreSQL each index is built with CREATE INDEX CONCURRENTLY IF NOT
+EXISTS, which doesn't block writes to the table while it runs and is a
+no-op for indexes that already exist.
+"""
+
+import asyncio
+
+from sqlalchemy.schema import CreateIndex
+from sqlmodel import SQLModel
+
+import models  # noqa: F401  (registers the tables on SQLModel.metadata)
+from database import get_engine
+
+
+def index_statements(dialect):
+    """Yield a CREATE INDEX statement for every index in the models."""
+    for table in SQLModel.metadata.sorted_tables:
+        for index in table.indexes:
+            sql = str(CreateIndex(index, if_not_exists=True).compile(dialect=dialect))
+            if dialect.name == "postgresql":
+                sql = sql.replace("INDEX", "INDEX CONCURRENTLY", 1)
+            yield sql
+
+
+async def create_indexes():
+    engine = get_engine()
+    # CONCURRENTLY can't run inside a transaction block
+    autocommit = engine.execution_options(isolation_level="AUTOCOMMIT")
+    async with autocommit.connect() as conn:
+        for sql in index_statements(engine.dialect):
+            print(sql)
+            await conn.exec_driver_sql(sql)
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(create_indexes())
@@ -1,14 +1,18 @@
 """
 Database Configuration for Neon PostgreSQL
 
-Uses SQLModel with dependency injection pattern for FastAPI.
-The get_session function yields a database session that is
-automatically closed after each request.
+Uses SQLModel's AsyncSession (SQLAlchemy asyncio + asyncpg) with the
+dependency injection pattern for FastAPI. The get_session function
+yields a database session that is automatically closed after each request.
 """
 
 import os
+from functools import lru_cache
 from urllib.parse import unquote
-from sqlmodel import SQLModel, Session, create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -26,34 +30,102 @@ if not DATABASE_URL:
 # Decode URL-encoded characters (e.g., %20 -> space)
 DATABASE_URL = unquote(DATABASE_URL)
 
-# Create engine with Neon-optimized settings
-# - pool_pre_ping: Verifies connection before use (handles serverless timeouts)
-# - echo: Set to True for SQL debugging, False in production
-engine = create_engine(
-    DATABASE_URL,
-    echo=True,  # Set to False in production
-    pool_pre_ping=True,  # Important for Neon serverless
-)
+# Async drivers for the plain URL schemes used in .env
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgres": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
 
 
-def create_db_and_tables():
+def to_async_url(url: str):
+    """
+    Convert a libpq-style connection string (as shown in the Neon
+    dashboard) to its async driver equivalent.
+
+    asyncpg takes `ssl` instead of `sslmode` and does not understand
+    `channel_binding`, so those query parameters are translated/dropped.
+    """
+    url = make_url(url)
+    url = url.set(drivername=ASYNC_DRIVERS.get(url.drivername, url.drivername))
+
+    if url.drivername == "postgresql+asyncpg":
+        query = dict(url.query)
+        sslmode = query.pop("sslmode", None)
+        query.pop("channel_binding", None)
+        if sslmode:
+            query["ssl"] = sslmode
+        url = url.set(query=query)
+
+    return url
+
+
+# Connection pool sizing (per worker process).
+# Peak connections = workers x (DB_POOL_SIZE + DB_MAX_OVERFLOW), and that
+# total must stay below the Neon compute's max_connections (e.g. ~112 on
+# 0.25 CU, ~450 on 1 CU) or use the "-pooler" (PgBouncer) endpoint.
+# The 5+5 default keeps even 8 workers at 80 connections; raise it
+# only as far as budget / WEB_CONCURRENCY allows.
+POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "5"))
+POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "5"))
+
+
+@lru_cache(maxsize=1)
+def get_engine():
+    """
+    Return the process-wide async engine, creating it on first use.
+
+    Cached so every request (and every call to create_db_and_tables /
+    get_session) shares one connection pool instead of re-parsing the
+    URL and building a new pool. Each worker process gets its own.
+
+    Neon-optimized settings:
+    - pool_size/max_overflow: Sized explicitly against the Neon
+      connection limit (see POOL_SIZE above) rather than left implicit
+    - pool_pre_ping: Verifies connection before use (handles serverless timeouts)
+    - pool_recycle: Replaces connections before Neon drops idle ones
+    - pool_timeout: Fail fast with an error instead of queueing requests
+      behind a saturated pool
+    - echo: Set to True for SQL debugging, False in production
+    """
+    return create_async_engine(
+        to_async_url(DATABASE_URL),
+        echo=True,  # Set to False in production
+        pool_pre_ping=True,  # Important for Neon serverless
+        pool_size=POOL_SIZE,
+        max_overflow=MAX_OVERFLOW,
+        pool_recycle=POOL_RECYCLE,
+        pool_timeout=POOL_TIMEOUT,
+    )
+
+
+async def create_db_and_tables():
     """
     Create all database tables defined in SQLModel classes.
     Called on application startup.
+
+    create_all skips tables that already exist, so indexes added to a
+    model later are not created here - run create_indexes.py once instead.
     """
-    SQLModel.metadata.create_all(engine)
+    async with get_engine().begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
 
 
-def get_session():
+async def get_session():
     """
     Dependency injection function for database sessions.
 
-    Yields a Session that is automatically closed after the request.
+    Yields an AsyncSession that is automatically closed after the request.
     Use with FastAPI's Depends():
 
         @app.get("/items")
-        def get_items(session: Session = Depends(get_session)):
+        async def get_items(session: AsyncSession = Depends(get_session)):
             ...
+
+    expire_on_commit=False keeps attributes loaded after commit, since
+    lazy reloads are not possible outside an awaited call.
     """
-    with Session(engine) as session:
+    async with AsyncSession(get_engine(), expire_on_commit=False) as session:
         yield session
@@ -0,0 +1,24 @@
+"""
+Gunicorn configuration for production
+
+Runs one Uvicorn worker per process so Pydantic validation and JSON
+encoding can use every CPU core. Start with:
+
+    gunicorn main:app -c gunicorn.conf.py
+
+Each worker builds its own database engine on first use (see
+database.get_engine), so pools are never shared across a fork.
+"""
+
+import multiprocessing
+import os
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+worker_class = "uvicorn.workers.UvicornWorker"
+# One worker per core: async workers don't need the 2x sync-worker rule, and
+# every worker opens its own DB pool, so peak Postgres connections are
+# workers x (DB_POOL_SIZE + DB_MAX_OVERFLOW) - keep that under the Neon limit
+# (see database.py) when raising WEB_CONCURRENCY.
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+timeout = 30
+keepalive = 5
@@ -7,12 +7,40 @@ SQLModel combines SQLAlchemy and Pydantic, giving us:
 - Type validation
 """
 
-from sqlmodel import SQLModel, Field
+from sqlalchemy import Enum as SAEnum
+from sqlalchemy.types import TypeDecorator
+from sqlmodel import SQLModel, Field, DateTime
 from typing import Optional
-from datetime import datetime
+from datetime import datetime, timezone
 from enum import Enum
 
 
+def utc_now() -> datetime:
+    """Current time as a timezone-aware UTC datetime"""
+    return datetime.now(timezone.utc)
+
+
+class UTCDateTime(TypeDecorator):
+    """
+    TIMESTAMP WITH TIME ZONE that always hands back aware UTC datetimes.
+
+    Postgres (timestamptz) already does; SQLite stores no offset and
+    returns naive values, which are tagged as UTC here.
+    """
+    impl = DateTime(timezone=True)
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is not None and value.tzinfo is not None:
+            value = value.astimezone(timezone.utc)
+        return value
+
+    def process_result_value(self, value, dialect):
+        if value is not None and value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value
+
+
 class TaskStatus(str, Enum):
     """Task status enumeration"""
     TODO = "todo"
@@ -25,15 +53,33 @@ class TaskBase(SQLModel):
     """Base Task model with common fields"""
     title: str = Field(min_length=1, max_length=200, description="Task title")
     description: Optional[str] = Field(default=None, max_length=1000, description="Task description")
-    status: TaskStatus = Field(default=TaskStatus.TODO, description="Task status")
+    status: TaskStatus = Field(
+        default=TaskStatus.TODO,
+        index=True,
+        # Native Postgres ENUM so the database enforces valid statuses;
+        # "taskstatus" is the type name existing databases already have
+        sa_type=SAEnum(TaskStatus, name="taskstatus", native_enum=True),
+        description="Task status",
+    )
 
 
 # Database table model
 class Task(TaskBase, table=True):
     """Task database table model"""
+    # Explicit: attribute writes on loaded rows must not re-run validation.
+    # Updates go through SQL UPDATE statements rather than setattr anyway.
+    model_config = {"validate_assignment": False}
+
     id: Optional[int] = Field(default=None, primary_key=True)
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: Optional[datetime] = Field(default=None)
+    # Stored as TIMESTAMP WITH TIME ZONE. Existing tables created with naive
+    # timestamps can be converted in place with:
+    #   ALTER TABLE task
+    #     ALTER COLUMN created_at TYPE timestamptz USING created_at AT TIME ZONE 'UTC',
+    #     ALTER COLUMN updated_at TYPE timestamptz USING updated_at AT TIME ZONE 'UTC';
+    created_at: datetime = Field(
+        default_factory=utc_now, index=True, sa_type=UTCDateTime
+    )
+    updated_at: Optional[datetime] = Field(default=None, sa_type=UTCDateTime)
 
 
 # Request schema for creating tasks
@@ -45,6 +91,10 @@ class TaskCreate(TaskBase):
 # Response schema for reading tasks
 class TaskRead(TaskBase):
     """Schema for reading a task (response)"""
+    # Read straight from Task rows (no intermediate dict) and compile the
+    # validator/serializer when the class is defined, not on first use
+    model_config = {"from_attributes": True, "defer_build": False}
+
     id: int
     created_at: datetime
     updated_at: Optional[datetime]
@@ -64,3 +114,4 @@ class TaskPatch(SQLModel):
     title: Optional[str] = Field(default=None, min_length=1, max_length=200)
     description: Optional[str] = Field(default=None, max_length=1000)
     status: Optional[TaskStatus] = None
+
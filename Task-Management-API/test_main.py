@@ -5,35 +5,89 @@ Uses in-memory SQLite database for testing to avoid
 requiring Neon credentials during test runs.
 """
 
+import asyncio
+from datetime import datetime, timedelta
+
+import fakeredis
 import pytest
 from fastapi.testclient import TestClient
-from sqlmodel import SQLModel, Session, create_engine
+from redis.exceptions import ConnectionError as RedisConnectionError
+from sqlalchemy import event
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects.postgresql.named_types import CreateEnumType
+from sqlalchemy.schema import CreateTable
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlmodel.pool import StaticPool
 
+import cache
 from main import app
-from database import get_session
-from models import Task
+from database import get_engine, get_session
+from models import Task, TaskBase, TaskCreate, TaskPatch, TaskRead, TaskUpdate
+
 
+@pytest.fixture(name="engine", scope="module")
+def engine_fixture():
+    """
+    Create an in-memory SQLite database (aiosqlite) once per module.
 
-@pytest.fixture(name="session")
-def session_fixture():
-    """Create an in-memory SQLite database for testing."""
-    engine = create_engine(
-        "sqlite://",  # In-memory database
+    Tables are created a single time; each test runs inside its own
+    transaction (see connection_fixture) and is rolled back afterwards.
+    """
+    engine = create_async_engine(
+        "sqlite+aiosqlite://",  # In-memory database
         connect_args={"check_same_thread": False},
         poolclass=StaticPool,
     )
-    SQLModel.metadata.create_all(engine)
 
-    with Session(engine) as session:
-        yield session
+    # pysqlite emits BEGIN lazily and breaks SAVEPOINT; let SQLAlchemy
+    # issue BEGIN itself so the per-test rollback covers everything
+    @event.listens_for(engine.sync_engine, "connect")
+    def do_connect(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine.sync_engine, "begin")
+    def do_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
+    async def create_tables():
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all)
+
+    asyncio.run(create_tables())
+    yield engine
+    asyncio.run(engine.dispose())
+
+
+@pytest.fixture(name="connection")
+def connection_fixture(engine):
+    """Open a connection with an outer transaction rolled back after the test."""
+    async def begin():
+        conn = await engine.connect()
+        await conn.begin()
+        return conn
+
+    async def rollback(conn):
+        await conn.rollback()
+        await conn.close()
+
+    conn = asyncio.run(begin())
+    yield conn
+    asyncio.run(rollback(conn))
 
 
 @pytest.fixture(name="client")
-def client_fixture(session: Session):
+def client_fixture(connection):
     """Create a test client with overridden database session."""
-    def get_session_override():
-        yield session
+    async def get_session_override():
+        # Endpoint commits only release a SAVEPOINT inside the test transaction
+        async with AsyncSession(
+            bind=connection,
+            expire_on_commit=False,
+            join_transaction_mode="create_savepoint",
+        ) as session:
+            yield session
 
     app.dependency_overrides[get_session] = get_session_override
     client = TestClient(app)
@@ -41,6 +95,52 @@ def client_fixture(session: Session):
     app.dependency_overrides.clear()
 
 
+# ============== DATABASE & MODEL TESTS ==============
+
+
+def test_get_engine_is_cached():
+    """Test that every caller shares one engine (and connection pool)."""
+    try:
+        assert get_engine() is get_engine()
+    finally:
+        get_engine.cache_clear()
+
+
+def test_models_built_at_import():
+    """Test that no model defers its validator/serializer to the first request."""
+    for model in (TaskBase, Task, TaskCreate, TaskRead, TaskUpdate, TaskPatch):
+        assert model.__pydantic_complete__, model.__name__
+
+
+def test_lifespan_creates_tables(monkeypatch):
+    """Test startup against a fresh database, running the real lifespan."""
+    engine = create_async_engine(
+        "sqlite+aiosqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    monkeypatch.setattr("database.get_engine", lambda: engine)
+
+    with TestClient(app) as client:
+        try:
+            response = client.post("/tasks/", json={"title": "Startup"})
+            assert response.status_code == 201
+            task_id = response.json()["id"]
+            assert client.get(f"/tasks/{task_id}").json()["title"] == "Startup"
+        finally:
+            client.portal.call(engine.dispose)
+
+
+def test_status_column_is_native_postgres_enum():
+    """Test that Postgres gets a native ENUM type for Task.status."""
+    ddl = str(CreateTable(Task.__table__).compile(dialect=postgresql.dialect()))
+    assert "status taskstatus NOT NULL" in ddl
+    enum_ddl = str(CreateEnumType(Task.__table__.c.status.type).compile(
+        dialect=postgresql.dialect()
+    ))
+    assert enum_ddl == "CREATE TYPE taskstatus AS ENUM ('TODO', 'IN_PROGRESS', 'DONE')"
+
+
 # ============== ROOT & HEALTH TESTS ==============
 
 
@@ -101,6 +201,50 @@ def test_create_task_with_status(client):
     assert response.json()["status"] == "in_progress"
 
 
+@pytest.mark.parametrize("task_status", ["todo", "in_progress", "done"])
+def test_task_status_round_trip(client, task_status):
+    """Test that every valid status is stored and read back unchanged."""
+    task_id = client.post(
+        "/tasks/", json={"title": "Status", "status": task_status}
+    ).json()["id"]
+
+    assert client.get(f"/tasks/{task_id}").json()["status"] == task_status
+    assert client.get("/tasks/").json()[0]["status"] == task_status
+
+
+def test_invalid_status_rejected(client):
+    """Test that statuses outside the enum are rejected on create and update."""
+    response = client.post("/tasks/", json={"title": "Bad", "status": "blocked"})
+    assert response.status_code == 422
+
+    task_id = client.post("/tasks/", json={"title": "Good"}).json()["id"]
+    response = client.patch(f"/tasks/{task_id}", json={"status": "TODO"})
+    assert response.status_code == 422
+    response = client.put(
+        f"/tasks/{task_id}",
+        json={"title": "Good", "description": None, "status": "archived"}
+    )
+    assert response.status_code == 422
+    assert client.get(f"/tasks/{task_id}").json()["status"] == "todo"
+
+
+def test_timestamps_are_timezone_aware(client):
+    """Test that created_at/updated_at come back as aware UTC datetimes."""
+    task = client.post("/tasks/", json={"title": "Clock"}).json()
+    task_id = task["id"]
+    patched = client.patch(f"/tasks/{task_id}", json={"title": "Tick"}).json()
+
+    for value in (
+        task["created_at"],
+        client.get(f"/tasks/{task_id}").json()["created_at"],
+        client.get("/tasks/").json()[0]["created_at"],
+        patched["created_at"],
+        patched["updated_at"],
+    ):
+        parsed = datetime.fromisoformat(value)
+        assert parsed.utcoffset() == timedelta(0), value
+
+
 def test_create_task_empty_title_fails(client):
     """Test that creating a task with empty title fails."""
     response = client.post(
@@ -110,6 +254,34 @@ def test_create_task_empty_title_fails(client):
     assert response.status_code == 422  # Validation error
 
 
+def test_create_tasks_bulk(client):
+    """Test creating several tasks in one request."""
+    response = client.post(
+        "/tasks/bulk",
+        json=[
+            {"title": "Bulk 1"},
+            {"title": "Bulk 2", "status": "done"},
+            {"title": "Bulk 3", "description": "Third"},
+        ]
+    )
+    assert response.status_code == 201
+    data = response.json()
+    assert [t["title"] for t in data] == ["Bulk 1", "Bulk 2", "Bulk 3"]
+    assert data[1]["status"] == "done"
+    assert data[2]["description"] == "Third"
+    assert all("id" in t and "created_at" in t for t in data)
+
+    assert len(client.get("/tasks/").json()) == 3
+
+
+def test_create_tasks_bulk_validation(client):
+    """Test that bulk create rejects empty lists and invalid items."""
+    assert client.post("/tasks/bulk", json=[]).status_code == 422
+    response = client.post("/tasks/bulk", json=[{"title": "OK"}, {"title": ""}])
+    assert response.status_code == 422
+    assert client.get("/tasks/").json() == []
+
+
 # ============== READ TASK TESTS ==============
 
 
@@ -147,6 +319,51 @@ def test_read_tasks_pagination(client):
     assert len(response.json()) == 2
 
 
+def test_read_tasks_limit_capped(client, monkeypatch):
+    """Test that limits above MAX_PAGE_SIZE are capped, not rejected."""
+    monkeypatch.setattr("main.MAX_PAGE_SIZE", 2)
+    for i in range(3):
+        client.post("/tasks/", json={"title": f"Task {i}"})
+
+    response = client.get("/tasks/?limit=101")
+    assert response.status_code == 200
+    assert len(response.json()) == 2
+
+
+def test_read_tasks_keyset_pagination(client):
+    """Test paging through tasks with the after_id cursor."""
+    ids = [
+        client.post("/tasks/", json={"title": f"Task {i}"}).json()["id"]
+        for i in range(5)
+    ]
+
+    page = client.get("/tasks/?limit=2").json()
+    assert [t["id"] for t in page] == ids[:2]
+
+    page = client.get(f"/tasks/?after_id={page[-1]['id']}&limit=2").json()
+    assert [t["id"] for t in page] == ids[2:4]
+
+    page = client.get(f"/tasks/?after_id={ids[-1]}").json()
+    assert page == []
+
+    response = client.get(f"/tasks/?after_id={ids[0]}&skip=1")
+    assert response.status_code == 422
+
+
+def test_read_tasks_gzip(client):
+    """Test that large task lists are gzip-compressed and small bodies are not."""
+    for i in range(20):
+        client.post("/tasks/", json={"title": f"Task {i}", "description": "x" * 50})
+
+    response = client.get("/tasks/", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert len(response.json()) == 20
+
+    response = client.get("/health", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+
+
 def test_read_single_task(client):
     """Test reading a single task by ID."""
     # Create a task
@@ -289,3 +506,107 @@ def test_delete_nonexistent_task(client):
     """Test deleting a task that doesn't exist."""
     response = client.delete("/tasks/999")
     assert response.status_code == 404
+
+
+# ============== CACHE TESTS ==============
+
+
+@pytest.fixture(name="redis")
+def redis_fixture(monkeypatch):
+    """Point the response cache at an in-process fake Redis."""
+    redis = fakeredis.FakeAsyncRedis()
+    monkeypatch.setattr(cache, "get_redis", lambda: redis)
+    monkeypatch.setattr(cache, "_down_until", 0.0)
+    return redis
+
+
+def redis_call(coro):
+    return asyncio.run(coro)
+
+
+def test_cache_read_through(client, redis):
+    """Test that GETs populate the cache and later GETs are served from it."""
+    task_id = client.post("/tasks/", json={"title": "Cached"}).json()["id"]
+    gen = redis_call(redis.get(cache.GENERATION_KEY)).decode()
+    item_key = f"tasks:{gen}:{cache.item_key(task_id)}"
+    list_key = f"tasks:{gen}:{cache.list_key(0, 100, None)}"
+
+    assert client.get(f"/tasks/{task_id}").json()["title"] == "Cached"
+    assert client.get("/tasks/").json()[0]["title"] == "Cached"
+    assert redis_call(redis.ttl(item_key)) > 0
+    assert redis_call(redis.ttl(list_key)) > 0
+
+    # Prove hits skip the database by planting different bodies
+    redis_call(redis.set(item_key, b'{"title": "from cache"}'))
+    redis_call(redis.set(list_key, b"[]"))
+    assert client.get(f"/tasks/{task_id}").json() == {"title": "from cache"}
+    assert client.get("/tasks/").json() == []
+
+
+def _write_create(client, task_id):
+    client.post("/tasks/", json={"title": "New"})
+
+
+def _write_bulk(client, task_id):
+    client.post("/tasks/bulk", json=[{"title": "New 1"}, {"title": "New 2"}])
+
+
+def _write_put(client, task_id):
+    client.put(
+        f"/tasks/{task_id}",
+        json={"title": "Changed", "description": None, "status": "done"}
+    )
+
+
+def _write_patch(client, task_id):
+    client.patch(f"/tasks/{task_id}", json={"title": "Changed"})
+
+
+def _write_delete(client, task_id):
+    client.delete(f"/tasks/{task_id}")
+
+
+@pytest.mark.parametrize(
+    "write",
+    [_write_create, _write_bulk, _write_put, _write_patch, _write_delete],
+    ids=["post", "bulk", "put", "patch", "delete"],
+)
+def test_cache_invalidated_by_writes(client, redis, write):
+    """Test that every write endpoint makes cached GET responses stale."""
+    task_id = client.post("/tasks/", json={"title": "Original"}).json()["id"]
+    before_item = client.get(f"/tasks/{task_id}")
+    before_list = client.get("/tasks/").json()
+
+    write(client, task_id)
+
+    after_item = client.get(f"/tasks/{task_id}")
+    after_list = client.get("/tasks/").json()
+    assert after_list != before_list
+    if write in (_write_put, _write_patch):
+        assert after_item.json()["title"] == "Changed"
+    elif write is _write_delete:
+        assert after_item.status_code == 404
+    else:
+        assert after_item.json() == before_item.json()
+
+
+def test_cache_redis_error_falls_back_to_database(client, monkeypatch):
+    """Test that a Redis outage degrades to uncached reads instead of errors."""
+    class BrokenRedis:
+        calls = 0
+
+        async def get(self, *args, **kwargs):
+            BrokenRedis.calls += 1
+            raise RedisConnectionError("connection refused")
+
+        set = incr = get
+
+    monkeypatch.setattr(cache, "get_redis", lambda: BrokenRedis())
+    monkeypatch.setattr(cache, "_down_until", 0.0)
+
+    task_id = client.post("/tasks/", json={"title": "No cache"}).json()["id"]
+    assert BrokenRedis.calls == 1  # invalidate failed and started the back-off
+
+    assert client.get(f"/tasks/{task_id}").json()["title"] == "No cache"
+    assert client.get("/tasks/").status_code == 200
+    assert BrokenRedis.calls == 1  # back-off window: Redis not retried